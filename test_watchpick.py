@@ -1,17 +1,137 @@
+import io
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import watchpick
 
 
+class IterFilesTests(unittest.TestCase):
+    def test_lists_only_files_directly_under_root(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            root = Path(tempdir)
+            top = root / "top.txt"
+            top.write_text("", encoding="utf-8")
+            (root / "nested").mkdir()
+            (root / "nested" / "inner.txt").write_text("", encoding="utf-8")
+
+            self.assertEqual(list(watchpick._iter_files(tempdir)), [str(top)])
+
+    def test_filters_by_extension(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            root = Path(tempdir)
+            text = root / "notes.txt"
+            text.write_text("", encoding="utf-8")
+            (root / "notes.md").write_text("", encoding="utf-8")
+            (root / "dir.txt").mkdir()
+            (root / ".txt").write_text("", encoding="utf-8")
+
+            self.assertEqual(list(watchpick._iter_files(tempdir, ".txt")), [str(text)])
+
+    def test_keeps_dir_entries_for_later_stat(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = Path(tempdir) / "notes.txt"
+            path.write_text("", encoding="utf-8")
+            os.utime(path, (100, 100))
+
+            entries = watchpick._iter_files(tempdir, ".txt")
+
+            self.assertEqual(list(entries), [str(path)])
+            self.assertEqual(entries[str(path)].stat().st_mtime, 100.0)
+
+
+class SortByMtimeDescTests(unittest.TestCase):
+    def _entries(self, root: Path, mtimes: dict[str, int]) -> dict:
+        for name, mtime in mtimes.items():
+            path = root / name
+            path.write_text("", encoding="utf-8")
+            os.utime(path, (mtime, mtime))
+        return watchpick._iter_files(str(root), ".txt")
+
+    def test_orders_newest_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            entries = self._entries(Path(tempdir), {"old.txt": 1, "new.txt": 2})
+            old = os.path.join(tempdir, "old.txt")
+            new = os.path.join(tempdir, "new.txt")
+
+            self.assertEqual(watchpick._sort_by_mtime_desc([old, new], entries), [new, old])
+
+    def test_limit_keeps_only_newest(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            entries = self._entries(Path(tempdir), {"a.txt": 1, "b.txt": 3, "c.txt": 2})
+
+            self.assertEqual(
+                watchpick._sort_by_mtime_desc(list(entries), entries, limit=2),
+                [os.path.join(tempdir, "b.txt"), os.path.join(tempdir, "c.txt")],
+            )
+
+
+class RelDisplayTests(unittest.TestCase):
+    def test_strips_root_prefix(self) -> None:
+        prefix = watchpick._root_prefix("/tmp/root")
+        self.assertEqual(watchpick._rel_display("/tmp/root/a.txt", prefix), "a.txt")
+
+    def test_handles_filesystem_root(self) -> None:
+        prefix = watchpick._root_prefix("/")
+        self.assertEqual(watchpick._rel_display("/a.txt", prefix), "a.txt")
+
+    def test_falls_back_to_name_outside_root(self) -> None:
+        prefix = watchpick._root_prefix("/tmp/root")
+        self.assertEqual(watchpick._rel_display("/tmp/rootx/a.txt", prefix), "a.txt")
+
+
+class WriteFzfInputTests(unittest.TestCase):
+    def test_writes_display_and_path_per_line(self) -> None:
+        stream = io.BytesIO()
+
+        watchpick._write_fzf_input(
+            stream, ["/tmp/root/a.txt", "/tmp/root/b.txt"], "/tmp/root"
+        )
+
+        self.assertEqual(
+            stream.getvalue(),
+            b"a.txt\t/tmp/root/a.txt\nb.txt\t/tmp/root/b.txt\n",
+        )
+
+
+class FindFzfTests(unittest.TestCase):
+    def test_resolves_fzf_once(self) -> None:
+        watchpick._find_fzf.cache_clear()
+        self.addCleanup(watchpick._find_fzf.cache_clear)
+        with mock.patch("shutil.which", return_value="/usr/bin/fzf") as which:
+            self.assertEqual(watchpick._find_fzf(), "/usr/bin/fzf")
+            self.assertEqual(watchpick._find_fzf(), "/usr/bin/fzf")
+        which.assert_called_once_with("fzf")
+
+
+class FzfArgvTests(unittest.TestCase):
+    def test_previews_with_head_and_saves_selection_with_printf(self) -> None:
+        argv = watchpick._fzf_argv("fzf", Path("/tmp/selection"))
+        self.assertIn("head -n 60 -- {2}", argv)
+        self.assertIn(
+            "--bind=enter:execute-silent(printf %s {2} > /tmp/selection)+abort",
+            argv,
+        )
+
+
+class FzfEnvTests(unittest.TestCase):
+    def test_runs_fzf_commands_under_plain_sh(self) -> None:
+        with mock.patch.dict(os.environ, {"SHELL": "/bin/zsh", "HOME": "/home/user"}):
+            env = watchpick._fzf_env()
+
+        self.assertEqual(env["SHELL"], "/bin/sh")
+        self.assertEqual(env["HOME"], "/home/user")
+
+
 class ResolveFzfSelectionTests(unittest.TestCase):
     def test_returns_selection_even_on_nonzero_exit(self) -> None:
         with tempfile.TemporaryDirectory() as tempdir:
             selection_path = Path(tempdir) / "selection.txt"
             selection_path.write_text("/tmp/example.txt", encoding="utf-8")
             selected = watchpick._resolve_fzf_selection(selection_path, returncode=1)
-            self.assertEqual(selected, Path("/tmp/example.txt"))
+            self.assertEqual(selected, "/tmp/example.txt")
 
     def test_empty_selection_returns_none(self) -> None:
         with tempfile.TemporaryDirectory() as tempdir:
@@ -21,6 +141,20 @@ class ResolveFzfSelectionTests(unittest.TestCase):
             self.assertIsNone(selected)
 
 
+class PickWithNumberedListTests(unittest.TestCase):
+    def test_lists_files_and_returns_chosen_path(self) -> None:
+        paths = ["/tmp/root/a.txt", "/tmp/root/b.txt"]
+        stderr = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO("2\n")), mock.patch("sys.stderr", stderr):
+            selected = watchpick._pick_with_numbered_list(paths, "/tmp/root")
+
+        self.assertEqual(selected, "/tmp/root/b.txt")
+        self.assertEqual(
+            stderr.getvalue(),
+            " 1. a.txt\n 2. b.txt\nSelect a file by number (empty to cancel): ",
+        )
+
+
 class BuildWatchArgvTests(unittest.TestCase):
     def test_includes_max_and_min_cps_when_provided(self) -> None:
         argv = watchpick._build_watch_argv(
@@ -74,6 +208,55 @@ class WatchWorkdirTests(unittest.TestCase):
         self.assertEqual(workdir, Path("/home/weiying/node/sub"))
 
 
+class ExecWatchTests(unittest.TestCase):
+    def test_replaces_process_from_workdir(self) -> None:
+        argv = ["npx", "tsx", "/repo/src/cli/watch.ts", "/tmp/input.txt"]
+        with mock.patch("os.chdir") as chdir, mock.patch("os.execvp") as execvp:
+            watchpick._exec_watch(argv, Path("/repo"))
+
+        chdir.assert_called_once_with(Path("/repo"))
+        execvp.assert_called_once_with("npx", argv)
+
+
+class MainTests(unittest.TestCase):
+    def test_passes_picked_symlink_unresolved_under_resolved_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            base = Path(os.path.realpath(tempdir))
+            texts = base / "texts"
+            texts.mkdir()
+            target = base / "elsewhere.txt"
+            target.write_text("", encoding="utf-8")
+            (texts / "linked.txt").symlink_to(target)
+            (base / "texts-link").symlink_to(texts)
+
+            watch_ts = base / "repo" / "src" / "cli" / "watch.ts"
+            watch_ts.parent.mkdir(parents=True)
+            watch_ts.write_text("", encoding="utf-8")
+            (base / "repo-link").symlink_to(base / "repo")
+
+            argv = [
+                "watchpick.py",
+                "--watch-ts",
+                str(base / "repo-link" / "src" / "cli" / "watch.ts"),
+                "--type",
+                "news",
+            ]
+            with mock.patch.dict(os.environ, {"TEXT_ROOT": str(base / "texts-link")}), \
+                    mock.patch("sys.argv", argv), \
+                    mock.patch("sys.stdin", io.StringIO("1\n")), \
+                    mock.patch("sys.stderr", io.StringIO()), \
+                    mock.patch.object(watchpick, "_find_fzf", return_value=None), \
+                    mock.patch("os.chdir") as chdir, \
+                    mock.patch("os.execvp") as execvp:
+                watchpick.main()
+
+        chdir.assert_called_once_with(base / "repo")
+        execvp.assert_called_once_with(
+            "npx",
+            ["npx", "tsx", str(watch_ts), str(texts / "linked.txt"), "--type", "news"],
+        )
+
+
 class FilterPickerFilesTests(unittest.TestCase):
     def test_subs_only_shows_files_with_sibling_baseline(self) -> None:
         with tempfile.TemporaryDirectory() as tempdir:
@@ -85,9 +268,21 @@ class FilterPickerFilesTests(unittest.TestCase):
             skip.write_text("", encoding="utf-8")
             baseline.write_text("", encoding="utf-8")
 
-            files = [keep, skip, baseline]
+            files = [str(keep), str(skip), str(baseline)]
 
-            self.assertEqual(watchpick._filter_picker_files(files, "subs"), [keep])
+            self.assertEqual(watchpick._filter_picker_files(files, "subs"), [str(keep)])
+
+    def test_subs_pairs_leading_dot_names_like_pathlib(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            root = Path(tempdir)
+            dotted = root / "..txt"
+            baseline = root / "..baseline.txt"
+            dotted.write_text("", encoding="utf-8")
+            baseline.write_text("", encoding="utf-8")
+
+            files = [str(dotted), str(baseline)]
+
+            self.assertEqual(watchpick._filter_picker_files(files, "subs"), [str(dotted)])
 
     def test_news_shows_baseline_files_and_normal_files(self) -> None:
         with tempfile.TemporaryDirectory() as tempdir:
@@ -99,12 +294,9 @@ class FilterPickerFilesTests(unittest.TestCase):
             baseline.write_text("", encoding="utf-8")
             other.write_text("", encoding="utf-8")
 
-            files = [normal, baseline, other]
+            files = [str(normal), str(baseline), str(other)]
 
-            self.assertEqual(
-                watchpick._filter_picker_files(files, "news"),
-                [normal, baseline, other],
-            )
+            self.assertEqual(watchpick._filter_picker_files(files, "news"), files)
 
 
 if __name__ == "__main__":
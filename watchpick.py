@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 
 import argparse
+import collections
+import functools
+import heapq
 import os
 import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
-from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, NoReturn
+
+TEXT_EXT = ".txt"
+NUMBERED_LIST_SIZE = 50
 
 
 def _default_watch_ts() -> Path:
@@ -18,59 +24,103 @@ def _default_watch_ts() -> Path:
     return Path('~/node/sub/src/cli/watch.ts').expanduser()
 
 
-def _iter_files(root: Path) -> list[Path]:
-    return [p for p in root.iterdir() if p.is_file()]
+def _iter_files(root: str, ext: str | None = None) -> dict[str, os.DirEntry[str]]:
+    # DirEntry answers is_file() from d_type and caches stat() for the sort.
+    files: dict[str, os.DirEntry[str]] = {}
+    with os.scandir(root) as it:
+        for entry in it:
+            name = entry.name
+            # A bare ".txt" has no suffix, matching Path.suffix.
+            if ext is not None and not (len(name) > len(ext) and name.endswith(ext)):
+                continue
+            if entry.is_file():
+                files[entry.path] = entry
+    return files
 
 
-def _sort_by_mtime_desc(paths: list[Path]) -> list[Path]:
-    return sorted(paths, key=lambda p: p.stat().st_mtime, reverse=True)
+def _sort_by_mtime_desc(
+    paths: list[str], entries: dict[str, os.DirEntry[str]], limit: int | None = None
+) -> list[str]:
+    def mtime(path: str) -> float:
+        return entries[path].stat().st_mtime
 
+    if limit is not None:
+        # Only the newest `limit` files are shown, so skip sorting the rest.
+        return heapq.nlargest(limit, paths, key=mtime)
+    return sorted(paths, key=mtime, reverse=True)
 
-def _rel_display(path: Path, root: Path) -> str:
-    try:
-        return str(path.relative_to(root))
-    except ValueError:
-        return path.name
 
+def _root_prefix(root: str) -> str:
+    # Joining "" adds exactly one trailing separator, even for "/".
+    return os.path.join(root, "")
+
+
+def _rel_display(path: str, root_prefix: str) -> str:
+    if path.startswith(root_prefix):
+        return path[len(root_prefix):]
+    return os.path.basename(path)
 
-def _pick_with_fzf(paths: list[Path], root: Path) -> Path | None:
-    fzf = shutil.which("fzf")
-    if not fzf:
-        return None
 
-    lines: list[str] = []
+def _write_fzf_input(stream: BinaryIO, paths: list[str], root: str) -> None:
+    root_prefix = _root_prefix(root)
     for path in paths:
-        display = _rel_display(path, root)
-        lines.append(f"{display}\t{path}")
+        stream.write(f"{_rel_display(path, root_prefix)}\t{path}\n".encode("utf-8"))
 
-    argv = [
+
+def _fzf_argv(fzf: str, selection_path: Path) -> list[str]:
+    bind = (
+        "enter:execute-silent("
+        f"printf %s {{2}} > {shlex.quote(str(selection_path))}"
+        ")+abort"
+    )
+    return [
         fzf,
         "--delimiter=\t",
         "--with-nth=1",
         "--nth=1",
         "--prompt=watch> ",
         "--preview",
-        "sed -n '1,60p' {2}",
+        "head -n 60 -- {2}",
         "--preview-window=right:60%:wrap",
         "--cycle",
+        f"--bind={bind}",
     ]
 
+
+def _fzf_env() -> dict[str, str]:
+    # fzf runs --preview and --bind commands through $SHELL; a plain sh
+    # starts much faster than an interactive user shell on every keypress.
+    return {**os.environ, "SHELL": "/bin/sh"}
+
+
+@functools.lru_cache(maxsize=None)
+def _find_fzf() -> str | None:
+    return shutil.which("fzf")
+
+
+def _pick_with_fzf(paths: list[str], root: str) -> str | None:
+    fzf = _find_fzf()
+    if not fzf:
+        return None
+
     selection_path = Path(
         tempfile.NamedTemporaryFile(prefix="watchpick-fzf-", delete=False).name
     )
-    bind = (
-        "enter:execute-silent("
-        f"echo -n {{2}} > {shlex.quote(str(selection_path))}"
-        ")+abort"
-    )
-    argv.append(f"--bind={bind}")
+    argv = _fzf_argv(fzf, selection_path)
+    env = _fzf_env()
 
     try:
-        proc = subprocess.run(
-            argv,
-            input=("\n".join(lines) + "\n").encode("utf-8"),
-        )
-        selected = _resolve_fzf_selection(selection_path, proc.returncode)
+        proc = subprocess.Popen(argv, stdin=subprocess.PIPE, bufsize=1 << 16, env=env)
+        try:
+            _write_fzf_input(proc.stdin, paths, root)
+        except BrokenPipeError:
+            # fzf exited (e.g. the user aborted) before reading every line.
+            pass
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        selected = _resolve_fzf_selection(selection_path, proc.wait())
     finally:
         try:
             selection_path.unlink()
@@ -82,20 +132,24 @@ def _pick_with_fzf(paths: list[Path], root: Path) -> Path | None:
     return None
 
 
-def _resolve_fzf_selection(selection_path: Path, returncode: int) -> Path | None:
+def _resolve_fzf_selection(selection_path: Path, returncode: int) -> str | None:
     selected = selection_path.read_text(encoding="utf-8").strip()
     if selected:
-        return Path(selected)
+        return selected
     if returncode != 0:
         return None
     return None
 
 
-def _pick_with_numbered_list(paths: list[Path], root: Path) -> Path | None:
-    shown = paths[:50]
-    for i, path in enumerate(shown, start=1):
-        print(f"{i:>2}. {_rel_display(path, root)}", file=sys.stderr)
-    print("Select a file by number (empty to cancel): ", end="", file=sys.stderr, flush=True)
+def _pick_with_numbered_list(paths: list[str], root: str) -> str | None:
+    shown = paths[:NUMBERED_LIST_SIZE]
+    root_prefix = _root_prefix(root)
+    listing = "".join(
+        f"{i:>2}. {_rel_display(path, root_prefix)}\n"
+        for i, path in enumerate(shown, start=1)
+    )
+    sys.stderr.write(listing + "Select a file by number (empty to cancel): ")
+    sys.stderr.flush()
     choice = sys.stdin.readline().strip()
     if not choice:
         return None
@@ -117,16 +171,26 @@ def _default_baseline_for(file_path: Path, baseline_root: Path | None) -> Path:
     return file_path.with_name(name)
 
 
-def _is_baseline_file(path: Path) -> bool:
-    return path.stem.endswith(".baseline")
+def _split_suffix(path: str) -> tuple[str, str]:
+    # Same rule as Path.suffix, which unlike os.path.splitext splits "..txt".
+    name = os.path.basename(path)
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return path[: len(path) - len(name) + i], name[i:]
+    return path, ""
+
 
+def _is_baseline_file(path: str) -> bool:
+    return _split_suffix(os.path.basename(path))[0].endswith(".baseline")
 
-def _sibling_baseline_for(file_path: Path) -> Path:
-    return file_path.with_name(f"{file_path.stem}.baseline{file_path.suffix}")
 
+def _sibling_baseline_for(file_path: str) -> str:
+    stem, suffix = _split_suffix(file_path)
+    return f"{stem}.baseline{suffix}"
 
-def _filter_files_with_baseline(paths: list[Path]) -> list[Path]:
-    return [p for p in paths if not _is_baseline_file(p) and _sibling_baseline_for(p).exists()]
+
+def _filter_files_with_baseline(paths: list[str]) -> list[str]:
+    return [p for p in paths if not _is_baseline_file(p) and os.path.exists(_sibling_baseline_for(p))]
 
 
 def _build_watch_argv(
@@ -164,15 +228,21 @@ def _watch_workdir_from_watch_ts(watch_ts: Path) -> Path:
     ):
         return watch_ts.parent.parent.parent
     return watch_ts.parent
-@dataclass(frozen=True)
-class Config:
-    root: Path
-    watch_ts: Path
-    type_: str
-    passthrough: list[str]
 
 
-def _filter_picker_files(paths: list[Path], type_: str) -> list[Path]:
+def _exec_watch(argv: list[str], workdir: Path) -> NoReturn:
+    # Nothing runs after the watch command, so hand the process over to it
+    # instead of keeping Python resident to wait for its exit code.
+    os.chdir(workdir)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(argv[0], argv)
+
+
+Config = collections.namedtuple("Config", ["root", "watch_ts", "type_", "passthrough"])
+
+
+def _filter_picker_files(paths: list[str], type_: str) -> list[str]:
     if type_ == "subs":
         visible = [p for p in paths if not _is_baseline_file(p)]
         return _filter_files_with_baseline(visible)
@@ -203,37 +273,38 @@ def main() -> int:
         print(f"error: TEXT_ROOT does not exist: {root}", file=sys.stderr)
         return 1
 
-    watch_ts = Path(args.watch_ts).expanduser().resolve()
+    watch_ts = Path(os.path.realpath(os.path.expanduser(args.watch_ts)))
     if not watch_ts.exists():
         print(f"error: watch.ts not found: {watch_ts} (set $SUB_WATCH_TS or --watch-ts)", file=sys.stderr)
         return 1
 
     config = Config(
-        root=root.resolve(),
+        root=Path(os.path.realpath(root)),
         watch_ts=watch_ts,
         type_=args.type_,
         passthrough=passthrough[1:] if passthrough[:1] == ["--"] else passthrough,
     )
 
-    files = _iter_files(config.root)
-    files = [p for p in files if p.suffix == ".txt"]
-    files = _filter_picker_files(files, config.type_)
+    root_str = str(config.root)
+    entries = _iter_files(root_str, TEXT_EXT)
+    files = _filter_picker_files(list(entries), config.type_)
     if not files:
         print(f"error: no files found under {config.root}", file=sys.stderr)
         return 1
 
-    files = _sort_by_mtime_desc(files)
-
-    if shutil.which("fzf"):
-        selected = _pick_with_fzf(files, config.root)
+    if _find_fzf():
+        files = _sort_by_mtime_desc(files, entries)
+        selected = _pick_with_fzf(files, root_str)
         if selected is None:
             return 0
     else:
-        selected = _pick_with_numbered_list(files, config.root)
+        files = _sort_by_mtime_desc(files, entries, limit=NUMBERED_LIST_SIZE)
+        selected = _pick_with_numbered_list(files, root_str)
         if selected is None:
             return 0
 
-    file_path = selected.resolve()
+    # Picked paths are already absolute under the resolved root.
+    file_path = Path(selected)
     baseline_path = None
 
     argv = _build_watch_argv(
@@ -247,11 +318,7 @@ def main() -> int:
         passthrough=config.passthrough,
     )
 
-    try:
-        workdir = _watch_workdir_from_watch_ts(config.watch_ts)
-        return subprocess.run(argv, cwd=workdir).returncode
-    except KeyboardInterrupt:
-        return 130
+    _exec_watch(argv, _watch_workdir_from_watch_ts(config.watch_ts))
 
 
 if __name__ == "__main__":